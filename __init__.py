@@ -4,7 +4,7 @@ import importlib
 from bpy.app.handlers import persistent
 from bpy.types import Menu
 
-from . import operator_cross_section_add, acf_body_export_op
+from . import section_slicer, section_cache, operator_cross_section_add, acf_body_export_op
 
 bl_info = {
     "name": "(IMC) Blender X-Section tools",
@@ -20,6 +20,8 @@ bl_info = {
 }
 
 modules = [
+    section_slicer,
+    section_cache,
     operator_cross_section_add,
     acf_body_export_op
 ]
@@ -44,28 +46,33 @@ if _need_reload:
 
 
 def register() -> None:
-    if bpy.app.background:
-        return
     for m in modules:
+        # in background (headless) runs only the modules usable there are registered
+        if bpy.app.background and not getattr(m, 'register_in_background', False):
+            continue
         if hasattr(m, 'registry'):
             for c in m.registry:
                 bpy.utils.register_class(c)
         if hasattr(m, 'register'):
             m.register()
 
+    if bpy.app.background:
+        return
     for cls in classes:
         bpy.utils.register_class(cls)
 
 
 def unregister() -> None:
-    if bpy.app.background:
-        return
     for m in modules:
+        if bpy.app.background and not getattr(m, 'register_in_background', False):
+            continue
         if hasattr(m, 'registry'):
             for c in m.registry:
                 bpy.utils.unregister_class(c)
         if hasattr(m, 'unregister'):
             m.unregister()
 
+    if bpy.app.background:
+        return
     for cls in classes:
         bpy.utils.unregister_class(cls)
@@ -1,12 +1,14 @@
 import math
+import time
 from typing import List
 
 import bmesh
 import bpy
 import idprop
 import mathutils
+import numpy as np
 from bpy.props import (
-    IntProperty, BoolProperty
+    IntProperty, BoolProperty, StringProperty
 )
 from bpy_extras.object_utils import (
     AddObjectHelper
@@ -21,6 +23,16 @@ from mathutils.geometry import (
     intersect_line_plane, intersect_line_line_2d
 )
 
+from .section_cache import (
+    CACHE_DIR_NAME, DEFAULT_MAX_CACHE_MB, clear_cache, load_section, mesh_digest, resolve_cache_dir, section_key, store_section
+)
+from .section_slicer import (
+    DEFAULT_CHUNK_SIZE, MeshSlicer
+)
+
+# registered in background (headless) runs too, so scripts can generate (and cache) sections
+register_in_background = True
+
 
 def bound_box(mesh_objs: List[bpy.types.Object]):
     corn0X = []
@@ -172,6 +184,30 @@ def generate_sections(me, plane_co, plane_no):
     return verts, edges
 
 
+class BMeshSlicer:
+    '''
+    The original slicing: a world space bmesh copy of the target cut by generate_sections,
+    with the same interface as section_slicer.MeshSlicer
+    '''
+
+    def __init__(self, target_object: bpy.types.Object):
+        self.bm = bmesh.new()
+        self.bm.from_mesh(target_object.data)
+
+        # make sure the mesh is baked to the object transforms
+        # apply transforms equivalent
+        self.bm.transform(target_object.matrix_world)
+
+    def slice(self, plane_co: Vector, plane_no: Vector):
+        verts, edge_indices = generate_sections(self.bm, plane_co, plane_no)
+        return (np.array([v.to_tuple() for v in verts], dtype=np.float64).reshape(-1, 3),
+                np.array(edge_indices, dtype=np.int64).reshape(-1, 2))
+
+    def free(self):
+        # free the mesh storage
+        self.bm.free()
+
+
 class VIEW3D_PT_AddSectionsUI(Panel):
     bl_space_type = 'VIEW_3D'
     bl_region_type = 'UI'
@@ -197,6 +233,13 @@ class VIEW3D_PT_AddSectionsUI(Panel):
 
         col = layout.column(align=False)
         col.operator("mesh.cross_section_add", text="Generate")
+        col.operator("mesh.cross_section_add_modal", text="Generate (cancellable)")
+
+        col = layout.column()
+        col.label(text="Section cache:")
+        col.prop(context.scene, "xsection_cache_dir", text="")
+        col.prop(context.scene, "xsection_cache_max_mb")
+        col.operator("mesh.cross_section_clear_cache", text="Clear cache")
 
 
 class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
@@ -241,14 +284,46 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
         description="Generate the curve as a Bezier curve, alternative is a polyline",
         default=False
     )
+    use_chunked_slicing: BoolProperty(
+        name="Chunked slicing",
+        description="Slice the meshes in fixed size chunks straight from the mesh data, rather than from a transformed copy "
+                    "of each mesh (keeps memory use down on very large meshes)",
+        default=True
+    )
+    chunk_size: IntProperty(
+        name="Chunk size",
+        description="The number of vertices/edges/faces processed per chunk when slicing",
+        default=DEFAULT_CHUNK_SIZE,
+        min=1024
+    )
+    multi_plane: BoolProperty(
+        name="Multiple planes",
+        description="Use every selected empty carrying z_samples/body_id properties as a cutting plane, "
+                    "rather than just the active object",
+        default=False
+    )
+    use_cache: BoolProperty(
+        name="Use section cache",
+        description="Re-use sections cached on disk for unchanged meshes and planes, and cache the new ones",
+        default=True
+    )
+
+    # the extracted mesh data of the target being sliced (see target_slicer)
+    _slicer = None
+    _slicer_target = None
 
     def draw(self, context):
         layout = self.layout
         layout.use_property_split = True
         layout.use_property_decorate = False
 
+        layout.prop(self, "multi_plane")
         layout.prop(self, "generate_meshes")
         layout.prop(self, "generate_curve")
+        layout.prop(self, "use_chunked_slicing")
+        if self.use_chunked_slicing:
+            layout.prop(self, "chunk_size")
+        layout.prop(self, "use_cache")
 
         if self.generate_curve:
             box = layout.box()
@@ -256,11 +331,19 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
             box.prop(self, "generate_bezier")
             box.prop(self, "outer_surface")
             box.prop(self, "half_section_sampling")
-            sample_angles_prop = context.active_object.get('sample_angles')
-            if sample_angles_prop != None:
-                box.label(text="found sampling angles property, num-samples: {}".format(len(sample_angles_prop) + 2))
-            else:
+            if self.multi_plane:
+                # each plane empty carries its own sampling angles, num_samples covers the ones without
+                for plane_object in self.plane_objects(context):
+                    sample_angles_prop = plane_object.get('sample_angles')
+                    if sample_angles_prop != None:
+                        box.label(text="{}: sampling angles property, num-samples: {}".format(plane_object.name, len(sample_angles_prop) + 2))
                 box.prop(self, "num_samples")
+            else:
+                sample_angles_prop = context.active_object.get('sample_angles')
+                if sample_angles_prop != None:
+                    box.label(text="found sampling angles property, num-samples: {}".format(len(sample_angles_prop) + 2))
+                else:
+                    box.prop(self, "num_samples")
             box.prop(self, "save_sample_angles")
 
     @classmethod
@@ -268,7 +351,8 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
         # need at least 2 objects selected and 1 active
         return context.active_object is not None and len(context.selected_objects) > 1
 
-    def generate_curve_from_points(self, context, plane_location: Vector, points: list[Vector], z_adjust: float, body_id: int):
+    def generate_curve_from_points(self, context, plane_object: bpy.types.Object, plane_location: Vector, points: list[Vector], z_adjust: float,
+                                   body_id: int) -> bpy.types.Object:
         # create the Curve Datablock
         curve_data = bpy.data.curves.new('myCurve', type='CURVE')
 
@@ -296,7 +380,7 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
         curve_obj = bpy.data.objects.new('myCurve', curve_data)
         # Place at origin of the cutting plane
         curve_obj.location = plane_location  # context.active_object.location
-        curve_obj.rotation_euler = context.active_object.rotation_euler
+        curve_obj.rotation_euler = plane_object.rotation_euler
 
         # record the offset in z if we have one
         if z_adjust != 0.0:
@@ -308,46 +392,177 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
         # attach to scene
         context.view_layer.active_layer_collection.collection.objects.link(curve_obj)
 
-    def generate_section(self, context, z_offset: float, z_adjust: float, body_id: int):
-        # take the z axis from the active object
-        plane_location = context.active_object.location.copy()
+        return curve_obj
+
+    def target_slicer(self, target_object: bpy.types.Object):
+        '''
+        The mesh data of target_object extracted for slicing, kept while its stations are sliced (one target at a time)
+        '''
+        if self._slicer is None or self._slicer_target != target_object:
+            self.release_slicer()
+            if self.use_chunked_slicing:
+                # the transform is applied to the intersection points only, the mesh itself is never copied
+                self._slicer = MeshSlicer(target_object.data, target_object.matrix_world, self.chunk_size)
+            else:
+                self._slicer = BMeshSlicer(target_object)
+            self._slicer_target = target_object
+        return self._slicer
+
+    def release_slicer(self):
+        if self._slicer is not None:
+            self._slicer.free()
+        self._slicer = None
+        self._slicer_target = None
+
+    def slice_target(self, context, target_object: bpy.types.Object, stations: list):
+        '''
+        Slice one target object at a batch of stations, the mesh data is extracted once per target (see target_slicer).
+        Returns the section mesh (or None if the plane misses the object) for each station,
+        and the number of stations that were actually sliced rather than read from the cache
+        '''
+        planes = []
+        section_matrices = []
+        for plane_object, z_offset, *_ in stations:
+            plane_location, plane_z, section_matrix = self.station_plane(plane_object, z_offset)
+            planes.append((plane_location, plane_z))
+            section_matrices.append(section_matrix)
+
+        sections = [None] * len(stations)
+        use_cache = self.use_cache and not self._cache_failed
+        if use_cache:
+            try:
+                cache_dir = resolve_cache_dir(context.scene.xsection_cache_dir)
+                digest = mesh_digest(target_object.data)
+                method = 'chunked' if self.use_chunked_slicing else 'bmesh'
+                keys = [section_key(digest, target_object.matrix_world, plane_location, plane_z, method) for plane_location, plane_z in planes]
+                sections = [load_section(cache_dir, key) for key in keys]
+            except OSError as e:
+                self.cache_failed(e)
+                use_cache = False
+                sections = [None] * len(stations)
+
+        # slice whatever was not cached
+        missing = [i for i, section in enumerate(sections) if section is None]
+        if len(missing) > 0:
+            slicer = self.target_slicer(target_object)
+            for i in missing:
+                verts, edge_indices = slicer.slice(*planes[i])
+                sections[i] = (verts, edge_indices)
+                if use_cache:
+                    try:
+                        store_section(cache_dir, keys[i], verts, edge_indices, planes[i][0], planes[i][1], stations[i][1],
+                                      context.scene.xsection_cache_max_mb * 1024 * 1024)
+                    except OSError as e:
+                        self.cache_failed(e)
+                        use_cache = False
+
+        meshes = []
+        for (verts, edge_indices), section_matrix in zip(sections, section_matrices):
+            if len(edge_indices) == 0:
+                meshes.append(None)
+                continue
+
+            # world -> plane local
+            m = np.array(section_matrix, dtype=np.float64)
+            verts = verts @ m[:3, :3].T + m[:3, 3]
+
+            mesh = bpy.data.meshes.new("Section")
+            mesh.from_pydata(verts.tolist(), np.asarray(edge_indices).tolist(), [])
+            mesh.update()
+            meshes.append(mesh)
+
+        return meshes, len(missing)
+
+    def cache_failed(self, error: OSError):
+        # the cache is only an optimisation, carry on without it for the rest of the run
+        self._cache_failed = True
+        self.report({'WARNING'}, 'Section cache unavailable, continuing without it: {}'.format(error))
+
+    def station_plane(self, plane_object: bpy.types.Object, z_offset: float):
+        # take the z axis from the plane object
+        plane_location = plane_object.location.copy()
         plane_z = Vector((0, 0, -1))
-        plane_z.rotate(context.active_object.matrix_world.to_euler())
+        plane_z.rotate(plane_object.matrix_world.to_euler())
 
         plane_location = plane_location + plane_z * z_offset
 
-        meshes = []
-        for target_object in context.selected_objects:
-            if target_object != context.active_object and target_object.type == 'MESH':
-                bm = bmesh.new()
-                bm.from_mesh(target_object.data)
-
-                # make sure the mesh is baked to the object transforms
-                # apply transforms equivalent
-                bm.transform(target_object.matrix_world)
+        # world -> section (plane local) coordinates
+        mat_offset = mathutils.Matrix.Translation(Vector((0, 0, z_offset)))
+        section_matrix = mat_offset @ plane_object.matrix_world.inverted()
 
-                verts, edge_indices = generate_sections(bm, plane_location, plane_z)
+        return plane_location, plane_z, section_matrix
 
-                if len(edge_indices) > 0:
-                    mesh = bpy.data.meshes.new("Section")
+    def station_config(self, plane_object: bpy.types.Object):
+        sample_offsets = [0.0]
+        z_offset_prop = plane_object.get('z_samples')
+        if z_offset_prop != None:
+            if type(z_offset_prop) is idprop.types.IDPropertyArray:
+                sample_offsets = z_offset_prop.to_list()
+            else:
+                sample_offsets = [z_offset_prop]
 
-                    bm = bmesh.new()
+        z_adjust = 0.0
+        z_adjust_prop = plane_object.get('z_adjust')
+        if z_adjust_prop != None:
+            z_adjust = z_adjust_prop
 
-                    for v_co in verts:
-                        bm.verts.new(v_co)
+        body_id = 0
+        body_id_prop = plane_object.get('body_id')
+        if body_id_prop != None:
+            body_id = body_id_prop
 
-                    bm.verts.ensure_lookup_table()
+        return sample_offsets, z_adjust, body_id
+
+    def plane_objects(self, context) -> list[bpy.types.Object]:
+        if not self.multi_plane:
+            return [context.active_object]
+        # every selected empty carrying the station properties defines a cutting plane
+        return [o for o in context.selected_objects if o.type == 'EMPTY' and (o.get('z_samples') != None or o.get('body_id') != None)]
+
+    def collect_stations(self, context) -> list:
+        '''
+        The (plane object, z offset, z adjust, body id, sample angles object) of every station to be cut
+        '''
+        stations = []
+        for plane_object in self.plane_objects(context):
+            sample_offsets, z_adjust, body_id = self.station_config(plane_object)
+
+            # with several planes each one carries its own sampling angles,
+            # otherwise they are looked up on the last of the selected objects
+            sample_object = plane_object if self.multi_plane else context.selected_objects[-1]
+
+            for z_offset in sample_offsets:
+                stations.append((plane_object, z_offset, z_adjust, body_id, sample_object))
+
+        return stations
+
+    def collect_targets(self, context, stations: list) -> list[bpy.types.Object]:
+        plane_objects = [station[0] for station in stations]
+        return [o for o in context.selected_objects if o not in plane_objects and o.type == 'MESH']
+
+    def generate_station_sections(self, context, stations: list, targets: list[bpy.types.Object]):
+        # slice each target at every station in a single batch
+        station_meshes = [[] for _ in stations]
+        for target_object in targets:
+            try:
+                target_meshes, _ = self.slice_target(context, target_object, stations)
+            finally:
+                self.release_slicer()
+            for meshes, mesh in zip(station_meshes, target_meshes):
+                if mesh is not None:
+                    meshes.append(mesh)
 
-                    for edge_idx in edge_indices:
-                        bm.edges.new([bm.verts[i] for i in edge_idx])
+        for (plane_object, z_offset, z_adjust, body_id, sample_object), meshes in zip(stations, station_meshes):
+            plane_location, _, _ = self.station_plane(plane_object, z_offset)
+            self.finish_section(context, plane_object, meshes, plane_location, z_offset, z_adjust, body_id, sample_object)
 
-                    mat_offset = mathutils.Matrix.Translation(Vector((0, 0, z_offset)))
-                    bm.transform(mat_offset @ context.active_object.matrix_world.inverted())
-                    bm.to_mesh(mesh)
-                    # free the mesh storage
-                    bm.free()
-                    mesh.update()
-                    meshes.append(mesh)
+    def finish_section(self, context, plane_object: bpy.types.Object, meshes: list[bpy.types.Mesh], plane_location: Vector, z_offset: float,
+                       z_adjust: float, body_id: int, target_object: bpy.types.Object) -> list[bpy.types.Object]:
+        '''
+        Turn the section meshes of one station into section objects and the sampled surface curve,
+        returns the objects added to the scene
+        '''
+        created_objects = []
 
         if len(meshes) == 0:
             self.report({'WARNING'}, f'No cross sections generated at offset {z_offset}')
@@ -360,7 +575,7 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
                     point_count = len(sample_angles_prop)
 
                 points = [Vector((0,0,0))] * point_count
-                self.generate_curve_from_points(context, plane_location, points, z_adjust, body_id)
+                created_objects.append(self.generate_curve_from_points(context, plane_object, plane_location, points, z_adjust, body_id))
 
         else:
             section_objects = []
@@ -370,7 +585,7 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
 
                 # Place at origin of the cutting plane
                 section_object.location = plane_location  # context.active_object.location
-                section_object.rotation_euler = context.active_object.rotation_euler
+                section_object.rotation_euler = plane_object.rotation_euler
 
                 # append to the section collection
                 section_objects.append(section_object)
@@ -395,7 +610,7 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
                     self.report({'ERROR'},
                                 "supplied sample angle count mismatch, for {} samples expected {} angles, don't supply 0 and 180".format(self.num_samples,
                                                                                                                                          len(sample_angles)))
-                    return
+                    return created_objects
 
                 # should we write the angles back to target object to allow the user to edit and re-use?
                 if self.save_sample_angles:
@@ -415,7 +630,7 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
 
                 # print('points {}'.format(points))
 
-                self.generate_curve_from_points(context, plane_location, points, z_adjust, body_id)
+                created_objects.append(self.generate_curve_from_points(context, plane_object, plane_location, points, z_adjust, body_id))
 
             # delete or preserve the section meshes
             for section_object in section_objects:
@@ -424,36 +639,235 @@ class OBJECT_OT_AddSections(bpy.types.Operator, AddObjectHelper):
                     # Link the object to the active collection of current view layer,
                     # so that it'll appear in the current scene.
                     context.view_layer.active_layer_collection.collection.objects.link(section_object)
+                    created_objects.append(section_object)
                 else:
                     # remove it
                     bpy.data.objects.remove(section_object, do_unlink=True)
 
+        return created_objects
+
     def execute(self, context):
         if context.active_object == None:
             self.report({'INFO'}, 'No active object selected')
             return {'FINISHED'}
 
-        sample_offsets = [0.0]
-        z_offset_prop = context.active_object.get('z_samples')
-        if z_offset_prop != None:
-            if type(z_offset_prop) is idprop.types.IDPropertyArray:
-                sample_offsets = z_offset_prop.to_list()
+        self._cache_failed = False
+
+        stations = self.collect_stations(context)
+        if len(stations) == 0:
+            if self.multi_plane:
+                self.report({'WARNING'}, 'No cutting planes selected, expecting empties with z_samples or body_id properties')
+                return {'CANCELLED'}
+            self.report({'WARNING'}, 'No sample offsets found in the z_samples property of the active object')
+            return {'FINISHED'}
+
+        self.generate_station_sections(context, stations, self.collect_targets(context, stations))
+
+        return {'FINISHED'}
+
+
+# events passed on while the modal generation runs, the ones that only navigate the view
+MODAL_PASS_THROUGH_EVENTS = {
+    'MOUSEMOVE', 'INBETWEEN_MOUSEMOVE', 'MIDDLEMOUSE', 'WHEELUPMOUSE', 'WHEELDOWNMOUSE',
+    'TRACKPADPAN', 'TRACKPADZOOM', 'MOUSEROTATE', 'MOUSESMARTZOOM', 'NDOF_MOTION',
+    'WINDOW_DEACTIVATE', 'TIMER_REPORT'
+}
+
+
+def id_valid(id_data) -> bool:
+    '''
+    False once the datablock behind a python reference has been removed
+    '''
+    try:
+        id_data.name
+    except ReferenceError:
+        return False
+    return True
+
+
+class OBJECT_OT_AddSectionsModal(OBJECT_OT_AddSections):
+    """Add cross sections in the background, one object at one station per step (Esc to cancel)"""
+    bl_idname = "mesh.cross_section_add_modal"
+    bl_label = "Add cross-section (cancellable)"
+    bl_options = {'REGISTER', 'UNDO'}
+
+    _timer = None
+
+    def invoke(self, context, event):
+        if context.active_object == None:
+            self.report({'INFO'}, 'No active object selected')
+            return {'FINISHED'}
+
+        self._cache_failed = False
+
+        # capture the configuration now, the selection may change while we run
+        self._stations = self.collect_stations(context)
+        self._targets = self.collect_targets(context, self._stations)
+
+        if len(self._stations) == 0 or len(self._targets) == 0:
+            return self.execute(context)
+
+        # the units of work: slice one object at one station, object by object so each object's data is extracted once
+        # and kept over its stations, then once every object is sliced, build the section objects and curves of one station
+        self._units = [('slice', target_index, station) for target_index in range(len(self._targets)) for station in range(len(self._stations))]
+        self._units += [('finish', None, station) for station in range(len(self._stations))]
+        self._unit_index = 0
+        self._referenced_objects = self._targets + [o for station in self._stations for o in (station[0], station[4])]
+        self._station_meshes = [[] for _ in self._stations]
+        self._created_objects = []
+        self._created_data = []
+        self._saved_sample_angles = []
+        self._faces_done = 0
+        self._start_time = time.perf_counter()
+
+        wm = context.window_manager
+        wm.progress_begin(0, len(self._units))
+        self._timer = wm.event_timer_add(0.01, window=context.window)
+        wm.modal_handler_add(self)
+
+        return {'RUNNING_MODAL'}
+
+    def modal(self, context, event):
+        if event.type == 'ESC':
+            self.cancel(context)
+            self.report({'INFO'}, 'Cross section generation cancelled')
+            return {'CANCELLED'}
+
+        if event.type != 'TIMER':
+            # let the view be navigated, but block undo, deletes and other edits while we hold references to the objects
+            if event.type in MODAL_PASS_THROUGH_EVENTS:
+                return {'PASS_THROUGH'}
+            return {'RUNNING_MODAL'}
+
+        if not all(id_valid(o) for o in self._referenced_objects):
+            self.cancel(context)
+            self.report({'WARNING'}, 'Objects used by the cross section generation were removed, cancelled')
+            return {'CANCELLED'}
+
+        try:
+            finished = self.step(context)
+        except Exception as e:
+            self.cancel(context)
+            self.report({'ERROR'}, 'Cross section generation failed: {}'.format(e))
+            return {'CANCELLED'}
+
+        if finished:
+            self.end_modal(context)
+            return {'FINISHED'}
+
+        return {'RUNNING_MODAL'}
+
+    def step(self, context) -> bool:
+        '''
+        Process the next unit of work, returns True once all are done
+        '''
+        kind, target_index, station = self._units[self._unit_index]
+        self._unit_index += 1
+
+        if kind == 'slice':
+            target_object = self._targets[target_index]
+            meshes, sliced_count = self.slice_target(context, target_object, [self._stations[station]])
+            if meshes[0] is not None:
+                self._station_meshes[station].append(meshes[0])
+                self._created_data.append(meshes[0])
+            # sections read from the cache don't count towards the slicing rate
+            self._faces_done += len(target_object.data.polygons) * sliced_count
+
+            # last station of this object? let its extracted data go
+            if self._units[self._unit_index][1] != target_index:
+                self.release_slicer()
+
+            progress = "object {}/{}, station {}/{}".format(target_index + 1, len(self._targets), station + 1, len(self._stations))
+        else:
+            plane_object, z_offset, z_adjust, body_id, sample_object = self._stations[station]
+            self.record_sample_angles(sample_object)
+
+            plane_location, _, _ = self.station_plane(plane_object, z_offset)
+            created_objects = self.finish_section(context, plane_object, self._station_meshes[station], plane_location, z_offset,
+                                                  z_adjust, body_id, sample_object)
+            for created_object in created_objects:
+                if created_object.type == 'CURVE':
+                    self._created_data.append(created_object.data)
+            self._created_objects.extend(created_objects)
+            self._station_meshes[station] = []
+            progress = "building station {}/{}".format(station + 1, len(self._stations))
+
+        elapsed = time.perf_counter() - self._start_time
+        faces_per_sec = self._faces_done / elapsed if elapsed > 0 else 0
+        context.window_manager.progress_update(self._unit_index)
+        context.workspace.status_text_set(
+            "Cross sections: {} - {:.0f} faces/sec (Esc to cancel)".format(progress, faces_per_sec))
+
+        return self._unit_index == len(self._units)
+
+    def record_sample_angles(self, sample_object: bpy.types.Object):
+        # remember the sampling angles finish_section is about to overwrite, so a cancel can put them back
+        if not (self.generate_curve and self.save_sample_angles):
+            return
+        if any(o == sample_object for o, _ in self._saved_sample_angles):
+            return
+
+        previous = sample_object.get('sample_angles')
+        if type(previous) is idprop.types.IDPropertyArray:
+            previous = previous.to_list()
+        self._saved_sample_angles.append((sample_object, previous))
+
+    def cancel(self, context):
+        self.end_modal(context)
+
+        # roll back everything added so far
+        for created_object in self._created_objects:
+            if id_valid(created_object):
+                bpy.data.objects.remove(created_object, do_unlink=True)
+        for data in self._created_data:
+            if not id_valid(data):
+                continue
+            if isinstance(data, bpy.types.Mesh):
+                bpy.data.meshes.remove(data)
             else:
-                sample_offsets = [z_offset_prop]
+                bpy.data.curves.remove(data)
+
+        for sample_object, previous in self._saved_sample_angles:
+            if not id_valid(sample_object):
+                continue
+            if previous is None:
+                if 'sample_angles' in sample_object:
+                    del sample_object['sample_angles']
+            else:
+                sample_object['sample_angles'] = previous
 
-        z_adjust = 0.0
-        z_adjust_prop = context.active_object.get('z_adjust')
-        if z_adjust_prop != None:
-            z_adjust = z_adjust_prop
+        self._created_objects = []
+        self._created_data = []
+        self._station_meshes = [[] for _ in self._stations]
+        self._saved_sample_angles = []
 
-        body_id = 0
-        body_id_prop = context.active_object.get('body_id')
-        if body_id_prop != None:
-            body_id = body_id_prop
+    def end_modal(self, context):
+        wm = context.window_manager
+        if self._timer is not None:
+            wm.event_timer_remove(self._timer)
+            self._timer = None
+        wm.progress_end()
+        context.workspace.status_text_set(None)
 
-        for offset in sample_offsets:
-            self.generate_section(context, offset, z_adjust, body_id)
+        self.release_slicer()
 
+
+class OBJECT_OT_ClearSectionCache(bpy.types.Operator):
+    """Remove all the cached cross sections from the cache directory"""
+    bl_idname = "mesh.cross_section_clear_cache"
+    bl_label = "Clear cross-section cache"
+
+    def execute(self, context):
+        cache_dir = resolve_cache_dir(context.scene.xsection_cache_dir)
+        try:
+            removed, failed = clear_cache(cache_dir)
+        except OSError as e:
+            self.report({'ERROR'}, 'Could not clear the section cache in {}: {}'.format(cache_dir, e))
+            return {'CANCELLED'}
+        if failed > 0:
+            self.report({'WARNING'}, 'Removed {} cached sections from {}, {} could not be removed (in use?)'.format(removed, cache_dir, failed))
+        else:
+            self.report({'INFO'}, 'Removed {} cached sections from {}'.format(removed, cache_dir))
         return {'FINISHED'}
 
 
@@ -464,7 +878,9 @@ def menu_func(self, context):
 # Class List
 classes = (
     VIEW3D_PT_AddSectionsUI,
-    OBJECT_OT_AddSections
+    OBJECT_OT_AddSections,
+    OBJECT_OT_AddSectionsModal,
+    OBJECT_OT_ClearSectionCache
 )
 
 
@@ -473,11 +889,27 @@ def register():
     for cls in classes:
         bpy.utils.register_class(cls)
 
+    bpy.types.Scene.xsection_cache_dir = StringProperty(
+        name="Cache directory",
+        description="Where cached cross sections are stored, defaults to a '{}' directory next to the blend file".format(CACHE_DIR_NAME),
+        subtype='DIR_PATH',
+        default=""
+    )
+    bpy.types.Scene.xsection_cache_max_mb = IntProperty(
+        name="Max cache size (MB)",
+        description="The least recently used cached sections are removed once the cache grows beyond this size",
+        default=DEFAULT_MAX_CACHE_MB,
+        min=1
+    )
+
 
 def unregister():
     for cls in classes:
         bpy.utils.unregister_class(cls)
 
+    del bpy.types.Scene.xsection_cache_dir
+    del bpy.types.Scene.xsection_cache_max_mb
+
 
 if __name__ == "__main__":
     register()
@@ -0,0 +1,181 @@
+import hashlib
+import os
+import pathlib
+import tempfile
+
+import bpy
+import numpy as np
+
+from .section_slicer import (
+    read_foreach
+)
+
+# bump when the layout or meaning of the cached arrays changes, old entries then simply stop matching
+CACHE_VERSION = 1
+
+CACHE_DIR_NAME = 'xsection_cache'
+DEFAULT_MAX_CACHE_MB = 512
+
+# each entry is stored as <key>.verts.npy, <key>.edges.npy and <key>.station.npy
+ENTRY_PARTS = ('verts', 'edges', 'station')
+
+
+def default_cache_dir() -> pathlib.Path:
+    '''
+    Next to the blend file if it has been saved, otherwise in the temp directory
+    '''
+    if bpy.data.filepath:
+        return pathlib.Path(bpy.data.filepath).parent / CACHE_DIR_NAME
+    return pathlib.Path(tempfile.gettempdir()) / CACHE_DIR_NAME
+
+
+def resolve_cache_dir(cache_dir: str) -> pathlib.Path:
+    if cache_dir:
+        return pathlib.Path(bpy.path.abspath(cache_dir))
+    return default_cache_dir()
+
+
+def mesh_digest(me) -> bytes:
+    '''
+    Content hash of the mesh vertex locations and topology, read straight from the mesh data each time
+    (one array at a time) so any edit changes it
+    '''
+    h = hashlib.blake2b(digest_size=20)
+    for collection, attr, width in ((me.vertices, 'co', 3), (me.edges, 'vertices', 2), (me.polygons, 'loop_start', 1),
+                                    (me.loops, 'edge_index', 1)):
+        dtype = np.float32 if attr == 'co' else np.int32
+        h.update(len(collection).to_bytes(8, 'little'))
+        h.update(read_foreach(collection, attr, width, dtype).tobytes())
+    return h.digest()
+
+
+def section_key(digest: bytes, matrix_world, plane_co, plane_no, method: str) -> str:
+    '''
+    Cache key of the section of a mesh (identified by its mesh_digest) with the given world matrix cut by a world plane,
+    method names the slicing implementation so the results of different ones are kept apart
+    '''
+    h = hashlib.blake2b(digest_size=20)
+    h.update(CACHE_VERSION.to_bytes(4, 'little'))
+    h.update(method.encode())
+    h.update(digest)
+    h.update(np.array(matrix_world, dtype=np.float64).tobytes())
+    h.update(np.array(plane_co, dtype=np.float64).tobytes())
+    h.update(np.array(plane_no, dtype=np.float64).tobytes())
+    return h.hexdigest()
+
+
+def _entry_path(cache_dir: pathlib.Path, key: str, part: str) -> pathlib.Path:
+    return cache_dir / '{}.{}.npy'.format(key, part)
+
+
+def load_section(cache_dir: pathlib.Path, key: str):
+    '''
+    Returns the cached (verts, edges) world space section for key, memory mapped, or None if not cached
+    '''
+    paths = [_entry_path(cache_dir, key, part) for part in ENTRY_PARTS]
+    if not all(path.is_file() for path in paths):
+        return None
+
+    try:
+        verts = np.load(paths[0], mmap_mode='r')
+        edges = np.load(paths[1], mmap_mode='r')
+    except (ValueError, EOFError):
+        # truncated/corrupt entry, treat as a miss (it will be overwritten)
+        return None
+
+    # mark as recently used for the eviction (not possible in a read-only cache, which is still usable)
+    try:
+        for path in paths:
+            os.utime(path)
+    except OSError:
+        pass
+
+    return verts, edges
+
+
+def _remove_entry(paths) -> bool:
+    '''
+    Remove the files of an entry, returns False if any could not be removed
+    (e.g. on Windows while the entry is still memory mapped)
+    '''
+    removed = True
+    for path in paths:
+        try:
+            path.unlink(missing_ok=True)
+        except OSError:
+            removed = False
+    return removed
+
+
+def store_section(cache_dir: pathlib.Path, key: str, verts: np.ndarray, edges: np.ndarray, plane_co, plane_no, z_offset: float,
+                  max_bytes: int):
+    cache_dir.mkdir(parents=True, exist_ok=True)
+
+    station = np.concatenate((np.array(plane_co, dtype=np.float64), np.array(plane_no, dtype=np.float64), [z_offset]))
+    arrays = (np.asarray(verts, dtype=np.float64), np.asarray(edges, dtype=np.int32), station)
+
+    for part, array in zip(ENTRY_PARTS, arrays):
+        # write under a temporary name and move it into place, so other processes sharing the cache
+        # (or an interrupted overwrite) never leave a partial file at the entry path
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, prefix=key + '.', suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                np.save(f, array)
+            os.replace(temp_path, _entry_path(cache_dir, key, part))
+        except BaseException:
+            try:
+                os.unlink(temp_path)
+            except OSError:
+                pass
+            raise
+
+    evict(cache_dir, max_bytes)
+
+
+def _cache_entries(cache_dir: pathlib.Path):
+    '''
+    key -> list of the entry files
+    '''
+    entries = {}
+    if cache_dir.is_dir():
+        for path in cache_dir.glob('*.npy'):
+            key = path.name.split('.', 1)[0]
+            entries.setdefault(key, []).append(path)
+    return entries
+
+
+def evict(cache_dir: pathlib.Path, max_bytes: int):
+    '''
+    Remove the least recently used entries until the cache fits in max_bytes
+    '''
+    entries = []
+    total = 0
+    for key, paths in _cache_entries(cache_dir).items():
+        try:
+            stats = [path.stat() for path in paths]
+        except OSError:
+            continue
+        size = sum(stat.st_size for stat in stats)
+        entries.append((max(stat.st_mtime for stat in stats), size, paths))
+        total += size
+
+    for _, size, paths in sorted(entries, key=lambda entry: entry[0]):
+        if total <= max_bytes:
+            break
+        # entries in use are skipped, they'll go on a later eviction
+        if _remove_entry(paths):
+            total -= size
+
+
+def clear_cache(cache_dir: pathlib.Path) -> tuple[int, int]:
+    '''
+    Remove all the cache entries, returns the number removed and the number that could not be removed
+    '''
+    removed = 0
+    failed = 0
+    for paths in _cache_entries(cache_dir).values():
+        if _remove_entry(paths):
+            removed += 1
+        else:
+            failed += 1
+    return removed, failed
@@ -0,0 +1,334 @@
+from collections import OrderedDict
+
+import bpy
+import numpy as np
+from bpy.app.handlers import persistent
+
+# number of vertices/edges/faces processed per slice of the mesh data
+DEFAULT_CHUNK_SIZE = 262144
+
+# vertices closer to the plane than this (world units) are treated as lying on it
+ON_PLANE_EPSILON = 1e-6
+
+# the topology cache invalidation handlers are needed in background (headless) runs too
+register_in_background = True
+
+
+def read_foreach(collection, attr: str, width: int, dtype) -> np.ndarray:
+    '''
+    Read an attribute of a bpy collection into a flat native buffer (no python objects per element)
+    '''
+    buffer = np.empty(len(collection) * width, dtype=dtype)
+    collection.foreach_get(attr, buffer)
+    if width > 1:
+        return buffer.reshape(-1, width)
+    return buffer
+
+
+def local_plane(matrix_world, plane_co, plane_no):
+    '''
+    Express a world space plane as the signed distance function d(p) = a.p + b over the object local coordinates,
+    this lets us test the mesh against the plane without building a transformed copy of it
+    '''
+    m = np.array(matrix_world, dtype=np.float64)
+    n = np.array(plane_no, dtype=np.float64)
+    n = n / np.linalg.norm(n)
+
+    a = m[:3, :3].T @ n
+    b = n @ (m[:3, 3] - np.array(plane_co, dtype=np.float64))
+    return a, b
+
+
+def signed_distances(coords: np.ndarray, a: np.ndarray, b: float, chunk_size: int) -> np.ndarray:
+    dist = np.empty(len(coords), dtype=np.float64)
+    for start in range(0, len(coords), chunk_size):
+        dist[start:start + chunk_size] = coords[start:start + chunk_size] @ a + b
+    return dist
+
+
+def crossing_edges(edge_verts: np.ndarray, dist: np.ndarray, chunk_size: int):
+    '''
+    Find the edges cut by the plane, returns the (sorted) edge indices and the key of the point each one produces.
+    Keys below the vertex count are vertices lying on the plane (shared by all the edges meeting there),
+    keys above it are vertex count + edge index for edges crossing the plane between their end points
+    '''
+    n_verts = len(dist)
+    found_edges = []
+    found_keys = []
+    for start in range(0, len(edge_verts), chunk_size):
+        ev = edge_verts[start:start + chunk_size].astype(np.int64)
+        d0 = dist[ev[:, 0]]
+        d1 = dist[ev[:, 1]]
+        on0 = np.abs(d0) <= ON_PLANE_EPSILON
+        on1 = np.abs(d1) <= ON_PLANE_EPSILON
+
+        strict = ~on0 & ~on1 & ((d0 < 0) != (d1 < 0))
+        # an edge lying in the plane has no single intersection, skip it like intersect_line_plane does
+        touch0 = on0 & ~on1
+        touch1 = on1 & ~on0
+
+        idx = np.flatnonzero(strict | touch0 | touch1)
+        keys = np.where(strict[idx], n_verts + start + idx, np.where(touch0[idx], ev[idx, 0], ev[idx, 1]))
+
+        found_edges.append(start + idx)
+        found_keys.append(keys)
+
+    if not found_edges:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int64)
+    return np.concatenate(found_edges), np.concatenate(found_keys)
+
+
+def expand_ranges(starts: np.ndarray, counts: np.ndarray) -> np.ndarray:
+    '''
+    Concatenate the index ranges [start, start + count) without a python loop
+    '''
+    starts = starts.astype(np.int64)
+    counts = counts.astype(np.int64)
+    return np.repeat(starts - np.cumsum(counts) + counts, counts) + np.arange(counts.sum(), dtype=np.int64)
+
+
+def pair_face_keys(faces: np.ndarray, keys: np.ndarray, key_count: int) -> np.ndarray:
+    '''
+    Given the (face, point key) pairs of the cut edges, return the key pairs of the faces cut at exactly two
+    distinct points, each of those is a segment of the section
+    '''
+    if len(faces) == 0:
+        return np.empty((0, 2), dtype=np.int64)
+
+    # corner intersections produce the same key from more than one edge of a face, count them once
+    combined = np.unique(faces.astype(np.int64) * key_count + keys)
+    face_ids = combined // key_count
+    _, first, counts = np.unique(face_ids, return_index=True, return_counts=True)
+    first = first[counts == 2]
+
+    return np.stack((combined[first] % key_count, combined[first + 1] % key_count), axis=1)
+
+
+def key_coordinates(keys: np.ndarray, coords: np.ndarray, edge_verts: np.ndarray, dist: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+    '''
+    World space location of the section points identified by keys (see crossing_edges)
+    '''
+    n_verts = len(coords)
+    points = np.empty((len(keys), 3), dtype=np.float64)
+
+    on_vert = keys < n_verts
+    points[on_vert] = coords[keys[on_vert]]
+
+    ev = edge_verts[keys[~on_vert] - n_verts]
+    d0 = dist[ev[:, 0]]
+    d1 = dist[ev[:, 1]]
+    t = (d0 / (d0 - d1))[:, np.newaxis]
+    p0 = coords[ev[:, 0]].astype(np.float64)
+    points[~on_vert] = p0 + t * (coords[ev[:, 1]] - p0)
+
+    return points @ matrix[:3, :3].T + matrix[:3, 3]
+
+
+class MeshTopology:
+    '''
+    Compact (CSR) face->edge and edge->face index of a mesh.
+    The topology does not change between cuts, so this is built once per mesh and re-used (see mesh_topology)
+    '''
+
+    def __init__(self, me, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        chunk_size = max(1, chunk_size)
+        self.counts = topology_counts(me)
+        self.edge_verts = read_foreach(me.edges, 'vertices', 2, np.int32)
+
+        # face -> edges, the edges of face f are face_edges[face_offsets[f]:face_offsets[f + 1]]
+        # the loops of a face are contiguous and in face order, so the loop edges already are the CSR array
+        self.face_offsets = np.empty(len(me.polygons) + 1, dtype=np.int32)
+        me.polygons.foreach_get('loop_start', self.face_offsets[:-1])
+        self.face_offsets[-1] = len(me.loops)
+        self.face_edges = read_foreach(me.loops, 'edge_index', 1, np.int32)
+
+        # edge -> faces, the faces of edge e are edge_faces[edge_offsets[e]:edge_offsets[e + 1]]
+        edge_counts = np.bincount(self.face_edges, minlength=len(self.edge_verts)).astype(np.int32)
+        self.edge_offsets = np.zeros(len(self.edge_verts) + 1, dtype=np.int32)
+        np.cumsum(edge_counts, out=self.edge_offsets[1:])
+        del edge_counts
+
+        # counting sort of the loops by edge, a chunk at a time to keep the temporaries small
+        self.edge_faces = np.empty(len(self.face_edges), dtype=np.int32)
+        cursor = self.edge_offsets[:-1].copy()
+        for start in range(0, len(self.face_edges), chunk_size):
+            edges = self.face_edges[start:start + chunk_size]
+            loops = np.arange(start, start + len(edges), dtype=np.int32)
+            faces = (np.searchsorted(self.face_offsets, loops, side='right') - 1).astype(np.int32)
+
+            order = np.argsort(edges, kind='stable')
+            sorted_edges = edges[order]
+            # rank of each loop amongst the loops of the same edge within this chunk
+            run_starts = np.flatnonzero(np.concatenate(([True], sorted_edges[1:] != sorted_edges[:-1])))
+            run_lengths = np.diff(np.append(run_starts, len(sorted_edges)))
+            rank = np.arange(len(sorted_edges)) - np.repeat(run_starts, run_lengths)
+
+            self.edge_faces[cursor[sorted_edges] + rank] = faces[order]
+            cursor[sorted_edges[run_starts]] += run_lengths.astype(np.int32)
+
+    @property
+    def nbytes(self) -> int:
+        return self.edge_verts.nbytes + self.face_offsets.nbytes + self.face_edges.nbytes + self.edge_offsets.nbytes + self.edge_faces.nbytes
+
+    def faces_of_edges(self, edges: np.ndarray) -> np.ndarray:
+        '''
+        The (unique, sorted) faces adjacent to any of the given edges
+        '''
+        starts = self.edge_offsets[edges]
+        return np.unique(self.edge_faces[expand_ranges(starts, self.edge_offsets[edges + 1] - starts)])
+
+    def edges_of_faces(self, faces: np.ndarray):
+        '''
+        The (face, edge) pairs of the given faces as two flat arrays
+        '''
+        starts = self.face_offsets[faces]
+        counts = self.face_offsets[faces + 1] - starts
+        return np.repeat(faces, counts), self.face_edges[expand_ranges(starts, counts)]
+
+
+def topology_counts(me):
+    return len(me.vertices), len(me.edges), len(me.polygons), len(me.loops)
+
+
+# upper bound on the memory held by the cached topology indexes, least recently used entries go first
+MAX_TOPOLOGY_CACHE_BYTES = 1024 * 1024 * 1024
+
+# mesh pointer -> MeshTopology, in least recently used order, kept across runs so following cuts of an unchanged
+# mesh skip the indexing. The handlers below drop entries on geometry updates, undo/redo and file load,
+# mesh_topology also rebuilds an entry whose element counts no longer match
+_topology_cache = OrderedDict()
+
+
+def mesh_topology(me, chunk_size: int = DEFAULT_CHUNK_SIZE) -> MeshTopology:
+    key = me.as_pointer()
+    topology = _topology_cache.get(key)
+    # the pointer can be re-used by a new mesh, the element counts catch the obvious mismatches
+    if topology is None or topology.counts != topology_counts(me):
+        topology = MeshTopology(me, chunk_size)
+        _topology_cache[key] = topology
+
+    _topology_cache.move_to_end(key)
+    total = sum(entry.nbytes for entry in _topology_cache.values())
+    while total > MAX_TOPOLOGY_CACHE_BYTES and len(_topology_cache) > 1:
+        _, evicted = _topology_cache.popitem(last=False)
+        total -= evicted.nbytes
+
+    return topology
+
+
+def clear_topology_cache():
+    _topology_cache.clear()
+
+
+def plane_segments(coords: np.ndarray, topology: MeshTopology, matrix: np.ndarray, plane_co, plane_no, chunk_size: int):
+    '''
+    Stream the section segments of already extracted mesh data (object local coords, topology index and world matrix)
+    cut by a world space plane, chunk by chunk.
+    Yields (keys, coords) with keys an (n, 2) array of point keys and coords the matching (n, 2, 3) world locations,
+    the keys are stable over the whole mesh so the chunks can be merged (see merge_segments).
+
+    The vertices are never transformed as a whole: the plane is moved into the object space instead and only the
+    intersection points are transformed. Only the faces adjacent to the cut edges are visited, through the topology index.
+    '''
+    chunk_size = max(1, chunk_size)
+    a, b = local_plane(matrix, plane_co, plane_no)
+    dist = signed_distances(coords, a, b, chunk_size)
+
+    cut_edges, cut_keys = crossing_edges(topology.edge_verts, dist, chunk_size)
+    if len(cut_edges) == 0:
+        return
+
+    cut_faces = topology.faces_of_edges(cut_edges)
+
+    key_count = len(coords) + len(topology.edge_verts)
+    for start in range(0, len(cut_faces), chunk_size):
+        faces, edges = topology.edges_of_faces(cut_faces[start:start + chunk_size])
+
+        # look up the face edges in the (sorted) cut edges
+        pos = np.minimum(np.searchsorted(cut_edges, edges), len(cut_edges) - 1)
+        hit = cut_edges[pos] == edges
+
+        segments = pair_face_keys(faces[hit], cut_keys[pos[hit]], key_count)
+        if len(segments) > 0:
+            points = key_coordinates(segments.ravel(), coords, topology.edge_verts, dist, matrix)
+            yield segments, points.reshape(-1, 2, 3)
+
+
+def merge_segments(stream):
+    '''
+    Merge a stream of (keys, coords) segment chunks into a section: unique vertex locations (k, 3) and
+    the (m, 2) vertex index pairs of the edges, duplicated edges are only returned once
+    '''
+    key_chunks = []
+    coord_chunks = []
+    for keys, coords in stream:
+        key_chunks.append(keys)
+        coord_chunks.append(coords)
+
+    if not key_chunks:
+        return np.empty((0, 3), dtype=np.float64), np.empty((0, 2), dtype=np.int64)
+
+    keys = np.concatenate(key_chunks).ravel()
+    coords = np.concatenate(coord_chunks).reshape(-1, 3)
+
+    _, first, inverse = np.unique(keys, return_index=True, return_inverse=True)
+    edges = np.sort(inverse.reshape(-1, 2), axis=1)
+    edges = np.unique(edges, axis=0)
+
+    return coords[first], edges
+
+
+class MeshSlicer:
+    '''
+    The data of a mesh (object local vertices, world matrix and topology index) extracted once,
+    to be cut by any number of world space planes, one at a time (see slice)
+    '''
+
+    def __init__(self, me, matrix_world, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        self.chunk_size = max(1, chunk_size)
+        self.topology = mesh_topology(me, self.chunk_size)
+        self.coords = read_foreach(me.vertices, 'co', 3, np.float32)
+        self.matrix = np.array(matrix_world, dtype=np.float64)
+
+    def slice(self, plane_co, plane_no):
+        '''
+        The (verts, edges) section cut by a world space plane, only this plane's signed distances are held
+        '''
+        return merge_segments(plane_segments(self.coords, self.topology, self.matrix, plane_co, plane_no, self.chunk_size))
+
+    def free(self):
+        self.topology = None
+        self.coords = None
+
+
+@persistent
+def _topology_depsgraph_update(scene, depsgraph):
+    for update in depsgraph.updates:
+        if update.is_updated_geometry:
+            # the updates carry the evaluated copies, the cache is keyed by the original meshes
+            original = update.id.original
+            data = original.data if isinstance(original, bpy.types.Object) else original
+            if isinstance(data, bpy.types.Mesh):
+                _topology_cache.pop(data.as_pointer(), None)
+
+
+@persistent
+def _topology_clear(*args):
+    # file load and undo/redo can replace any mesh (and re-use its pointer)
+    clear_topology_cache()
+
+
+_clear_handlers = ('load_post', 'undo_post', 'redo_post')
+
+
+def register():
+    bpy.app.handlers.depsgraph_update_post.append(_topology_depsgraph_update)
+    for handlers in _clear_handlers:
+        getattr(bpy.app.handlers, handlers).append(_topology_clear)
+
+
+def unregister():
+    bpy.app.handlers.depsgraph_update_post.remove(_topology_depsgraph_update)
+    for handlers in _clear_handlers:
+        getattr(bpy.app.handlers, handlers).remove(_topology_clear)
+    clear_topology_cache()